@@ -6,10 +6,13 @@ Translates MCP stdio transport (used by Claude Desktop) to Streamable HTTP
 transport (used by mcpd on the microcontroller).
 
 Features:
+  - Persistent keep-alive connection to the MCU
+  - Concurrent requests, merged into JSON-RPC batches during bursts
   - Auto-reconnect on connection loss
-  - Configurable retry with exponential backoff
+  - Configurable retry with jittered exponential backoff
   - Structured logging with levels
   - mDNS discovery (optional, requires zeroconf)
+  - Faster JSON handling (optional, uses orjson if installed)
   - Session management with automatic re-initialization
 
 Usage:
@@ -29,16 +32,46 @@ Claude Desktop config (claude_desktop_config.json):
 import sys
 import json
 import argparse
-import urllib.request
-import urllib.error
+import http.client
+import urllib.parse
 import logging
+import queue
+import random
+import re
+import select
+import socket
+import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+# orjson is optional — several times faster than the stdlib on the small
+# JSON values the bridge parses and encodes
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 
 # ── Logging Setup ───────────────────────────────────────────────────────
 
 LOG_LEVEL = os.environ.get("MCPD_LOG_LEVEL", "INFO").upper()
 
+# The log format only uses time, level and message, so skip collecting the
+# caller's frame and thread/process info for every LogRecord
+logging._srcfile = None
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL, logging.INFO),
     format="[mcpd-bridge] %(asctime)s %(levelname)s %(message)s",
@@ -47,131 +80,775 @@ logging.basicConfig(
 )
 log = logging.getLogger("mcpd-bridge")
 
+# Cached once: the level never changes at runtime, and checking a flag lets
+# the per-message debug calls skip building their arguments entirely
+_DEBUG = log.isEnabledFor(logging.DEBUG)
+
 
 # ── Retry Configuration ────────────────────────────────────────────────
 
 MAX_RETRIES = int(os.environ.get("MCPD_MAX_RETRIES", "3"))
 RETRY_BASE_DELAY = float(os.environ.get("MCPD_RETRY_DELAY", "1.0"))
 REQUEST_TIMEOUT = int(os.environ.get("MCPD_TIMEOUT", "30"))
+MAX_INFLIGHT = max(1, int(os.environ.get("MCPD_MAX_INFLIGHT", "4")))
+PROBE_TIMEOUT = float(os.environ.get("MCPD_PROBE_TIMEOUT", "0.2"))
+MAX_BATCH = max(1, int(os.environ.get("MCPD_MAX_BATCH", "8")))
 
 
 # ── HTTP Transport ──────────────────────────────────────────────────────
 
-def send_request(base_url: str, body: str, session_id: str | None,
-                 timeout: int = REQUEST_TIMEOUT) -> tuple[int, str, str | None]:
+# Idle keep-alive connections to the MCU, reused across requests so each
+# JSON-RPC message doesn't pay for a fresh TCP handshake. Entries are
+# (connection, idle_since) pairs.
+_pool: list[tuple[http.client.HTTPConnection, float]] = []
+
+# Connections idle for less than this are reused without a health check —
+# under load that saves two syscalls per message, and send_request already
+# retries once if a reused socket turns out to be dead.
+POOL_RECHECK_AFTER = 1.0  # seconds
+
+
+class Endpoint(NamedTuple):
+    """The MCU's MCP endpoint, parsed once at startup."""
+    host: str
+    port: int
+    path: str  # request target, including any query string
+
+
+def parse_endpoint(base_url: str) -> Endpoint:
+    """Split an MCU URL into an Endpoint."""
+    parts = urllib.parse.urlsplit(base_url)
+    # The hostname is resolved on each connect, so a new DHCP lease is
+    # picked up on reconnect. The query string stays on the request target
+    # (it may carry ?key= for API-key auth).
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return Endpoint(parts.hostname, parts.port or 80, path)
+
+
+class MCUConnection(http.client.HTTPConnection):
+    """
+    HTTP connection tuned for small JSON-RPC messages on a LAN link.
+
+    TCP_NODELAY keeps Nagle from holding back small POSTs, and aggressive
+    keepalive probes notice a vanished MCU within ~25 s even while the
+    connection sits idle in the pool.
+    """
+
+    KEEPALIVE_IDLE = 10      # seconds idle before the first probe
+    KEEPALIVE_INTERVAL = 5   # seconds between probes
+    KEEPALIVE_COUNT = 3      # failed probes before the connection drops
+
+    def connect(self):
+        super().connect()
+        sock = self.sock
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, "TCP_KEEPIDLE"):  # Linux, newer macOS
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE,
+                                self.KEEPALIVE_IDLE)
+            elif hasattr(socket, "TCP_KEEPALIVE"):  # older macOS
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE,
+                                self.KEEPALIVE_IDLE)
+            if hasattr(socket, "TCP_KEEPINTVL"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL,
+                                self.KEEPALIVE_INTERVAL)
+            if hasattr(socket, "TCP_KEEPCNT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT,
+                                self.KEEPALIVE_COUNT)
+            if hasattr(socket, "SIO_KEEPALIVE_VALS"):  # Windows
+                sock.ioctl(socket.SIO_KEEPALIVE_VALS,
+                           (1, self.KEEPALIVE_IDLE * 1000,
+                            self.KEEPALIVE_INTERVAL * 1000))
+        except OSError as e:
+            # Tuning only — the connection works without it
+            log.debug("Could not tune MCU socket: %s", e)
+
+
+def _is_healthy(conn: http.client.HTTPConnection) -> bool:
+    """Check whether an idle pooled connection can still be used."""
+    sock = conn.sock
+    if sock is None:
+        return False
+    try:
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+            return False
+        # An idle socket has nothing to read — if it is readable, the MCU
+        # has closed its end (EOF) and the next request would fail.
+        readable, _, _ = select.select([sock], [], [], 0)
+        return not readable
+    except (OSError, ValueError):
+        return False
+
+
+def get_connection(host: str, port: int,
+                   timeout: int = REQUEST_TIMEOUT) -> http.client.HTTPConnection:
+    """Take a healthy idle connection from the pool, or open a new one."""
+    while True:
+        # pop() is atomic; a separate emptiness check would race with the
+        # other worker threads draining the pool
+        try:
+            conn, idle_since = _pool.pop()
+        except IndexError:
+            break
+        if time.monotonic() - idle_since < POOL_RECHECK_AFTER or _is_healthy(conn):
+            return conn
+        conn.close()
+    return MCUConnection(host, port, timeout=timeout)
+
+
+def return_connection(conn: http.client.HTTPConnection) -> None:
+    """Give a connection back to the pool (unless the MCU closed it)."""
+    if conn.sock is not None:
+        _pool.append((conn, time.monotonic()))
+
+
+# Set after a failed connect, cleared by the next HTTP response. While set,
+# each attempt starts with a quick TCP probe instead of a connect that can
+# block for the full REQUEST_TIMEOUT when the MCU is powered off.
+_mcu_down = threading.Event()
+
+
+class MCUUnreachable(ConnectionError):
+    """The MCU was already down and still fails a quick TCP probe."""
+
+
+class MCUConnectError(ConnectionError):
+    """A TCP connection to the MCU could not be established."""
+
+
+def _tcp_probe(host: str, port: int, timeout: float) -> bool:
+    """True if the MCU accepts a TCP connection within timeout seconds."""
+    try:
+        socket.create_connection((host, port), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
+def _wait_for_mcu(endpoint: Endpoint, delay: float) -> None:
+    """Sleep for up to delay seconds, returning early once the MCU is back."""
+    end = time.monotonic() + delay
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return
+        if _tcp_probe(endpoint.host, endpoint.port, min(0.1, remaining)):
+            return
+        time.sleep(max(0.0, min(0.1, end - time.monotonic())))
+
+
+def _is_event_stream(resp: http.client.HTTPResponse) -> bool:
+    """True if the MCU answered with an SSE stream rather than plain JSON."""
+    ctype = resp.headers.get("Content-Type", "")
+    return ctype.split(";", 1)[0].strip().lower() == "text/event-stream"
+
+
+class Reply(NamedTuple):
+    """What goes back to the client: a buffered body or a live SSE stream."""
+    body: bytes = b""  # newline-terminated message line(s)
+    stream: Iterator[bytes] | None = None  # one line per SSE event
+
+    def messages(self) -> Iterable[bytes]:
+        """The reply as stdout lines, yielded as they arrive."""
+        return self.stream if self.stream is not None else (self.body,)
+
+
+def iter_response(conn: http.client.HTTPConnection,
+                  resp: http.client.HTTPResponse) -> Iterator[bytes]:
     """
-    Send an HTTP POST to the MCU.
+    Yield JSON-RPC messages from an SSE response as each event arrives.
+
+    Each message is yielded as a newline-terminated stdout line.
+
+    Chunked and SSE bodies are read incrementally so progress notifications
+    and the final result reach the client without waiting for the MCU to
+    finish the whole stream. The connection goes back to the pool once the
+    stream is drained, and is closed if reading fails or stops early.
+    """
+    drained = False
+    try:
+        data: list[bytes] = []
+        for raw in resp:
+            line = raw.rstrip(b"\r\n")
+            if not line:
+                # Blank line terminates an event. Multi-line data is joined
+                # with spaces (valid JSON whitespace) to keep one message
+                # per stdout line.
+                if data:
+                    yield b" ".join(data) + b"\n"
+                    data = []
+            elif line.startswith(b"data:"):
+                value = line[5:]
+                data.append(value[1:] if value.startswith(b" ") else value)
+        if data:
+            yield b" ".join(data) + b"\n"
+        drained = True
+    finally:
+        if drained:
+            return_connection(conn)
+        else:
+            conn.close()
+
+
+@lru_cache(maxsize=4)
+def _request_head(endpoint: Endpoint, session_id: str | None) -> bytes:
+    """
+    Pre-encoded request line and headers for a POST, minus Content-Length.
+
+    Every request goes to the same URL with the same headers, and the
+    session id only changes on (re-)initialize, so the block is built once
+    per session instead of going through http.client's header machinery on
+    every message.
+    """
+    host = f"[{endpoint.host}]" if ":" in endpoint.host else endpoint.host
+    if endpoint.port != 80:
+        host = f"{host}:{endpoint.port}"
+    head = (f"POST {endpoint.path} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: application/json, text/event-stream\r\n")
+    if session_id:
+        head += f"Mcp-Session-Id: {session_id}\r\n"
+    return head.encode("latin-1")
+
+
+def _exchange(conn: http.client.HTTPConnection, request: bytes,
+              timeout: float) -> http.client.HTTPResponse:
+    """Write a complete request in one send and read the response head."""
+    if conn.sock is None:
+        try:
+            conn.connect()
+        except OSError as e:
+            raise MCUConnectError(
+                f"Cannot connect to {conn.host}:{conn.port}: {e}") from e
+    # Pooled sockets are shared by single requests and batches, which get
+    # different timeouts
+    conn.sock.settimeout(timeout)
+    conn.sock.sendall(request)
+    resp = conn.response_class(conn.sock, method="POST")
+    resp.begin()
+    if resp.will_close:
+        # The response keeps its own reference to the socket; dropping ours
+        # stops the connection from going back to the pool
+        conn.close()
+    return resp
+
+
+def send_request(endpoint: Endpoint, body: bytes, session_id: str | None,
+                 timeout: float = REQUEST_TIMEOUT
+                 ) -> tuple[int, Reply, str | None]:
+    """
+    Send an HTTP POST to the MCU over a pooled keep-alive connection.
+
+    Plain JSON responses are read in full; SSE responses are returned as a
+    lazy stream (see iter_response) that must be consumed by the caller.
+    Either way, messages are newline-terminated bytes ready for stdout.
 
     Returns:
-        (status_code, response_body, session_id)
+        (status_code, reply, session_id)
 
     Raises:
-        urllib.error.URLError on connection failure
-        urllib.error.HTTPError on HTTP errors
+        MCUConnectError if no connection to the MCU could be made
+        OSError / http.client.HTTPException if the exchange fails
     """
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json, text/event-stream",
-    }
-    if session_id:
-        headers["Mcp-Session-Id"] = session_id
+    host, port, _ = endpoint
+    request = b"%sContent-Length: %d\r\n\r\n%s" % (
+        _request_head(endpoint, session_id), len(body), body)
 
-    req = urllib.request.Request(
-        base_url,
-        data=body.encode("utf-8"),
-        headers=headers,
-        method="POST",
-    )
+    conn = get_connection(host, port)
+    reused = conn.sock is not None
+    try:
+        resp = _exchange(conn, request, timeout)
+    except (http.client.RemoteDisconnected, ConnectionError):
+        conn.close()
+        if not reused:
+            raise
+        # The MCU dropped the idle connection between our health check and
+        # the request — retry once on a fresh socket before giving up.
+        conn = get_connection(host, port)
+        try:
+            resp = _exchange(conn, request, timeout)
+        except Exception:
+            conn.close()
+            raise
+    except Exception:
+        conn.close()
+        raise
+
+    resp_session = resp.headers.get("Mcp-Session-Id")
+    new_session = resp_session if resp_session else session_id
 
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        resp_session = resp.headers.get("Mcp-Session-Id")
-        new_session = resp_session if resp_session else session_id
-        status = resp.status
+    if resp.status == 200 and _is_event_stream(resp):
+        return resp.status, Reply(stream=iter_response(conn, resp)), new_session
 
-        if status == 202:
-            return status, "", new_session
+    try:
+        response_body = resp.read() + b"\n"
+    except Exception:
+        conn.close()
+        raise
+    return_connection(conn)
 
-        response_body = resp.read().decode("utf-8")
-        return status, response_body, new_session
+    return resp.status, Reply(response_body), new_session
 
 
-def send_with_retry(base_url: str, body: str, session_id: str | None,
-                    msg: dict) -> tuple[str | None, str | None]:
+def send_with_retry(endpoint: Endpoint, body: bytes, session_id: str | None,
+                    timeout: float = REQUEST_TIMEOUT, resend: bool = True
+                    ) -> tuple[Reply | None, str | None]:
     """
     Send request with retry logic and exponential backoff.
 
+    With resend=False, a request that may have reached the MCU (the
+    connection dropped or timed out after sending) is not sent again;
+    only failures to connect are retried.
+
     Returns:
-        (response_body_or_None, session_id)
+        (reply_or_None, session_id)
     """
     last_error = None
 
     for attempt in range(MAX_RETRIES + 1):
+        unreachable = False
         try:
-            status, resp_body, new_session = send_request(
-                base_url, body, session_id
+            if _mcu_down.is_set() and not _tcp_probe(
+                    endpoint.host, endpoint.port, PROBE_TIMEOUT):
+                raise MCUUnreachable(
+                    f"MCU unreachable ({endpoint.host}:{endpoint.port})")
+            status, reply, new_session = send_request(
+                endpoint, body, session_id, timeout
             )
+        except MCUUnreachable as e:
+            # Known down before this message arrived: fail in milliseconds
+            # rather than wedging it behind a full retry cycle
+            if attempt == 0:
+                log.warning("%s, failing fast", e)
+                return Reply(_make_error_response(body, -32000, str(e))), session_id
+            log.error("%s", e)
+            last_error = str(e)
+            unreachable = True
+        except MCUConnectError as e:
+            log.error("%s", e)
+            last_error = str(e)
+            unreachable = True
+            _mcu_down.set()
+        except (OSError, http.client.HTTPException) as e:
+            # The MCU accepted the connection but dropped or stalled the
+            # exchange; it is up, so back off normally
+            log.error("Connection error: %s", e)
+            last_error = f"Connection error: {e}"
+            if not resend:
+                return Reply(_make_error_response(body, -32000,
+                                                  last_error)), session_id
+        except Exception as e:
+            log.error("Unexpected error: %s", e)
+            last_error = f"Unexpected error: {e}"
+        else:
+            _mcu_down.clear()
 
             if status == 202:
-                log.debug("← MCU: 202 Accepted")
+                if _DEBUG:
+                    log.debug("← MCU: 202 Accepted")
                 return None, new_session
 
-            log.debug("← MCU: %s", resp_body[:200])
-            return resp_body, new_session
+            if 200 <= status < 300:
+                if _DEBUG:
+                    if reply.stream is None:
+                        log.debug("← MCU: %s",
+                                  reply.body[:200].decode("utf-8", "replace").rstrip())
+                    else:
+                        log.debug("← MCU: event stream")
+                return reply, new_session
 
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8", errors="replace")
-            log.error("HTTP %d: %s", e.code, error_body)
+            # Only 200 responses are streamed, so the body is buffered here
+            resp_body = reply.body.decode("utf-8", "replace").rstrip()
+            log.error("HTTP %d: %s", status, resp_body)
 
             # 404 = session expired, clear and retry with re-init
-            if e.code == 404:
+            if status == 404:
                 log.warning("Session expired, clearing session ID")
                 session_id = None
                 # Don't retry 404 — let the client re-initialize
-                return _make_error_response(msg, -32000,
-                                            f"Session expired (HTTP 404)"), None
+                return Reply(_make_error_response(body, -32000,
+                                                  f"Session expired (HTTP 404)")), None
 
             # 4xx errors are not retryable
-            if 400 <= e.code < 500:
-                return _make_error_response(msg, -32000,
-                                            f"HTTP {e.code}: {error_body}"), session_id
-
-            last_error = f"HTTP {e.code}: {error_body}"
-
-        except urllib.error.URLError as e:
-            log.error("Connection error: %s", e.reason)
-            last_error = f"Connection error: {e.reason}"
+            if 400 <= status < 500:
+                return Reply(_make_error_response(body, -32000,
+                                                  f"HTTP {status}: {resp_body}")), session_id
 
-        except Exception as e:
-            log.error("Unexpected error: %s", e)
-            last_error = f"Unexpected error: {e}"
+            last_error = f"HTTP {status}: {resp_body}"
 
-        # Retry with exponential backoff
+        # Retry with jittered exponential backoff, so bridges restarted
+        # together (e.g. after an MCU reboot) don't reconnect in lockstep
         if attempt < MAX_RETRIES:
-            delay = RETRY_BASE_DELAY * (2 ** attempt)
+            delay = RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
             log.info("Retrying in %.1fs (attempt %d/%d)...",
                      delay, attempt + 1, MAX_RETRIES)
-            time.sleep(delay)
+            if unreachable:
+                # Cut the wait short as soon as the MCU accepts connections
+                _wait_for_mcu(endpoint, delay)
+            else:
+                time.sleep(delay)
 
     # All retries exhausted
     log.error("All %d retries exhausted. Last error: %s",
               MAX_RETRIES + 1, last_error)
-    return _make_error_response(msg, -32000,
-                                f"Connection failed after {MAX_RETRIES + 1} attempts: {last_error}"), session_id
+    return Reply(_make_error_response(body, -32000,
+                                      f"Connection failed after {MAX_RETRIES + 1} attempts: {last_error}")), session_id
+
+
+# Matches an "id" key anywhere in a raw message. It can also hit an "id"
+# nested in params, which only costs an extra ordering slot for a message
+# that turns out to need no reply — a top-level id is never missed.
+_ID_KEY_RE = re.compile(rb'"id"\s*:')
 
 
-def _make_error_response(msg: dict, code: int, message: str) -> str:
-    """Create a JSON-RPC error response string."""
-    return json.dumps({
-        "jsonrpc": "2.0",
-        "id": msg.get("id"),
-        "error": {"code": code, "message": message},
-    })
+def _expects_response(line: bytes) -> bool:
+    """True if the client may wait for a reply (a request, or a batch with one)."""
+    return _ID_KEY_RE.search(line) is not None
+
+
+def _is_batchable(line: bytes) -> bool:
+    """
+    True if a message can be merged into a JSON-RPC batch POST: a request
+    (it has both an id and a method) that isn't itself a batch. MCP forbids
+    batching initialize, and mcpd's batch path doesn't route replies to
+    server-initiated requests, so those always go out on their own.
+
+    Unlike _expects_response this parses the message, so an "id" nested in
+    a notification's params can't pull it into a batch. It only runs on
+    messages that arrived in a burst.
+    """
+    if line.lstrip().startswith(b"[") or not _expects_response(line):
+        return False
+    try:
+        msg = _loads(line)
+    except ValueError:
+        return False
+    return (isinstance(msg, dict)
+            and msg.get("id") is not None
+            and isinstance(msg.get("method"), str)
+            and msg["method"] != "initialize")
+
+
+def _request_id(line: bytes):
+    """Extract the id of a request. Only needed on the error path."""
+    try:
+        msg = _loads(line)
+    except ValueError:
+        return None
+    return msg.get("id") if isinstance(msg, dict) else None
+
+
+# Pre-formatted error response; only the id and message need JSON encoding
+_ERROR_TEMPLATE = b'{"jsonrpc": "2.0", "id": %s, "error": {"code": %d, "message": %s}}\n'
+
+
+# Errors with which a server rejects a whole batch (parse error, invalid
+# request). The bridge itself only reports -32000 and -32603, so these can
+# only come from the MCU.
+_BATCH_REJECTED = (-32700, -32600)
+
+
+def _make_error_response(line: bytes, code: int, message: str) -> bytes:
+    """Create a JSON-RPC error response line for the request in line."""
+    return _ERROR_TEMPLATE % (_dumps(_request_id(line)), code, _dumps(message))
+
+
+def _make_error_responses(lines: tuple[bytes, ...], code: int,
+                          message: str) -> bytes:
+    """Error response lines for every request in lines."""
+    return b"".join(_make_error_response(line, code, message) for line in lines)
+
+
+# Strings (matched whole, so brackets and commas inside them are skipped)
+# and the structural characters that delimit the elements of an array
+_BATCH_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{},]', re.DOTALL)
+
+
+def _split_batch(body: bytes) -> list[bytes]:
+    """
+    Split a JSON-RPC batch response into one stdout line per reply.
+
+    The replies are sliced out of the MCU's bytes rather than decoded and
+    re-encoded, so each goes out exactly as the MCU wrote it.
+    """
+    replies = []
+    depth = 0
+    start = 0
+    for m in _BATCH_TOKEN_RE.finditer(body):
+        ch = body[m.start()]
+        if ch == 0x22:  # string
+            continue
+        if ch in b"[{":
+            depth += 1
+            if depth == 1:
+                start = m.end()
+            continue
+        if ch in b"]}":
+            depth -= 1
+            if depth:
+                continue
+        elif depth != 1:  # comma inside a reply
+            continue
+        reply = body[start:m.start()].strip()
+        if reply:
+            replies.append(reply + b"\n")
+        start = m.end()
+    return replies
+
+
+def _split_batch_events(stream: Iterator[bytes]) -> Iterator[bytes]:
+    """Pass an SSE stream through, splitting any batch reply it carries."""
+    for message in stream:
+        if message.startswith(b"["):
+            yield from _split_batch(message)
+        else:
+            yield message
+
+
+# ── Dispatch ───────────────────────────────────────────────────────────
+
+class Bridge:
+    """
+    Forwards JSON-RPC messages to the MCU with up to MAX_INFLIGHT requests
+    in flight at once, hiding the link round-trip time behind each other.
+
+    Responses to requests (messages with an id) are written to stdout in
+    submission order by a single writer thread. Notifications are
+    fire-and-forget: they go out in order on their own lane, so a burst of
+    them never holds up a request, and their outcome is only logged. The
+    price is that they are not ordered against requests: a tools/list sent
+    right after notifications/initialized may reach the MCU first. mcpd
+    ignores notifications/initialized, so that is harmless today.
+
+    Requests that arrive together (e.g. parallel tool calls) are sent as
+    one JSON-RPC batch of up to MAX_BATCH messages, paying a single round
+    trip for all of them. The batch's replies are forwarded as the MCU
+    wrote them, in the MCU's order.
+    """
+
+    def __init__(self, endpoint: Endpoint,
+                 on_disconnect: Callable[[], None] | None = None):
+        self.endpoint = endpoint
+        # Set once the stdout reader has gone away; on_disconnect lets the
+        # caller stop feeding messages in
+        self.disconnected = threading.Event()
+        self._on_disconnect = on_disconnect
+        self.session_id: str | None = None
+        self._session_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_INFLIGHT,
+                                            thread_name_prefix="mcu")
+        self._notify_executor = ThreadPoolExecutor(max_workers=1,
+                                                   thread_name_prefix="mcu-notify")
+        # One slot per request in flight; while all are taken, new messages
+        # queue up on stdin and go out together as the next batch
+        self._slots = threading.BoundedSemaphore(MAX_INFLIGHT)
+        self._outbox: queue.Queue = queue.Queue()
+        # Write bytes straight to the binary stdout buffer: one write and one
+        # flush per message, with no str concatenation or re-encoding
+        self._out = sys.stdout.buffer.write
+        self._flush = sys.stdout.buffer.flush
+        self._writer = threading.Thread(target=self._write_responses,
+                                        name="stdout-writer", daemon=True)
+        self._writer.start()
+
+    def wait_for_slot(self) -> None:
+        """Block until fewer than MAX_INFLIGHT requests are in flight."""
+        with self._slots:
+            pass
+
+    def submit(self, line: bytes) -> None:
+        """Queue a message for sending to the MCU."""
+        if _expects_response(line):
+            self._submit_request(self._forward, line, (line,))
+        else:
+            self._notify_executor.submit(self._forward, line)
+
+    def submit_all(self, lines: list[bytes]) -> None:
+        """Queue messages read together, batching runs of requests among them."""
+        batch: list[bytes] = []
+        for line in lines:
+            if _is_batchable(line):
+                batch.append(line)
+                continue
+            # Anything that can't join the batch (e.g. initialize) ends it,
+            # so messages are still submitted in stdin order
+            self._submit_batch(batch)
+            batch = []
+            self.submit(line)
+        self._submit_batch(batch)
+
+    def _submit_batch(self, batch: list[bytes]) -> None:
+        if len(batch) == 1:
+            self.submit(batch[0])
+        elif batch:
+            lines = tuple(batch)
+            self._submit_request(self._forward_batch, lines, lines)
+
+    def _submit_request(self, fn, arg, lines: tuple[bytes, ...]) -> None:
+        self._slots.acquire()
+        future = self._executor.submit(fn, arg)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._outbox.put((future, lines))
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting messages; optionally wait for pending responses."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._notify_executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._outbox.put(None)
+        if wait:
+            self._writer.join()
+
+    def _forward(self, line: bytes, timeout: float = REQUEST_TIMEOUT,
+                 resend: bool = True) -> Reply | None:
+        with self._session_lock:
+            session_id = self.session_id
+
+        reply, new_session = send_with_retry(
+            self.endpoint, line, session_id, timeout, resend
+        )
+
+        # Only record a change made by this request, so a slow response
+        # can't roll back a session update from a newer one
+        if new_session != session_id:
+            with self._session_lock:
+                self.session_id = new_session
+        return reply
+
+    def _forward_batch(self, lines: tuple[bytes, ...]) -> Reply | None:
+        # mcpd runs batch items one after another, so the batch gets each
+        # message's timeout. Once sent it is never resent: the MCU may have
+        # run some of its tool calls already.
+        reply = self._forward(b"[" + b",".join(lines) + b"]",
+                              REQUEST_TIMEOUT * len(lines), resend=False)
+        if reply is None:
+            return None  # 202
+        if reply.stream is not None:
+            return Reply(stream=_split_batch_events(reply.stream))
+
+        body = reply.body
+        if body.lstrip().startswith(b"["):
+            return Reply(b"".join(_split_batch(body)))
+
+        try:
+            replies = _loads(body)
+        except ValueError:
+            replies = None
+        error = replies.get("error") if isinstance(replies, dict) else None
+        if not isinstance(error, dict):
+            return Reply(_make_error_responses(lines, -32603,
+                                               "Invalid batch response from MCU"))
+        if error.get("code") in _BATCH_REJECTED:
+            # The MCU answered, but rejected the batch as a whole (e.g. it
+            # didn't fit its JSON buffer). Resend individually so every
+            # request gets its own reply or error.
+            log.warning("Batch of %d rejected by MCU, resending individually",
+                        len(lines))
+            parts: list[bytes] = []
+            for line in lines:
+                reply = self._forward(line)
+                if reply is not None:
+                    parts.extend(reply.messages())
+            return Reply(b"".join(parts))
+
+        # The bridge's own error (transport failure, HTTP error): it applies to every request in the batch, and
+        # resending them would re-run the retry cycle and the tool calls
+        return Reply(_make_error_responses(lines, error.get("code", -32000),
+                                           str(error.get("message", ""))))
+
+    def _write_responses(self) -> None:
+        while True:
+            item = self._outbox.get()
+            if item is None:
+                return
+            future, lines = item
+
+            try:
+                reply = future.result()
+            except Exception as e:
+                log.error("Request failed: %s", e, exc_info=True)
+                reply = Reply(_make_error_responses(lines, -32603,
+                                                    f"Internal error: {e}"))
+
+            if reply is None:
+                continue
+
+            try:
+                self._write(reply.messages(), lines)
+            except BrokenPipeError:
+                self.disconnected.set()
+                if self._on_disconnect is not None:
+                    self._on_disconnect()
+                return
+
+    def _write(self, messages: Iterable[bytes], lines: tuple[bytes, ...]) -> None:
+        # Forward each message as soon as it arrives (SSE streams yield
+        # one message per event)
+        out, flush = self._out, self._flush
+        try:
+            for resp_body in messages:
+                out(resp_body)
+                flush()
+        except BrokenPipeError:
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            log.error("Stream from MCU interrupted: %s", e)
+            out(_make_error_responses(lines, -32000,
+                                      f"Stream interrupted: {e}"))
+            flush()
 
 
 # ── mDNS Discovery ─────────────────────────────────────────────────────
 
+DISCOVERY_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "mcpd-bridge.json",
+)
+DISCOVERY_CACHE_TTL = 3600  # seconds
+
+
+def _load_cached_mcu() -> tuple[str | None, int | None]:
+    """Return the last discovered MCU if the cache is fresh and it answers."""
+    try:
+        if os.path.getmtime(DISCOVERY_CACHE) < time.time() - DISCOVERY_CACHE_TTL:
+            return None, None
+        with open(DISCOVERY_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)
+        host, port = cached["host"], int(cached["port"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+    if not _tcp_probe(host, port, 0.3):
+        log.info("Cached MCU %s:%d not reachable, rediscovering", host, port)
+        return None, None
+
+    log.info("Using cached MCU at %s:%d", host, port)
+    return host, port
+
+
+def _save_cached_mcu(host: str, port: int) -> None:
+    try:
+        os.makedirs(os.path.dirname(DISCOVERY_CACHE), exist_ok=True)
+        with open(DISCOVERY_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"host": host, "port": port}, f)
+    except OSError as e:
+        log.debug("Could not write discovery cache: %s", e)
+
+
 def discover_mcu(timeout_s: float = 5.0) -> tuple[str | None, int | None]:
-    """Discover mcpd server via mDNS (requires zeroconf)."""
+    """
+    Discover mcpd server via mDNS (requires zeroconf).
+
+    The last result is cached for an hour and reused on the next start as
+    long as the MCU still accepts connections, skipping the mDNS browse.
+    """
+    host, port = _load_cached_mcu()
+    if host:
+        return host, port
+
     try:
         from zeroconf import ServiceBrowser, Zeroconf
     except ImportError:
@@ -179,6 +856,7 @@ def discover_mcu(timeout_s: float = 5.0) -> tuple[str | None, int | None]:
         return None, None
 
     result = {"host": None, "port": None}
+    found = threading.Event()
 
     class Listener:
         def add_service(self, zc, type_, name):
@@ -189,6 +867,7 @@ def discover_mcu(timeout_s: float = 5.0) -> tuple[str | None, int | None]:
                 result["host"] = str(addr)
                 result["port"] = info.port
                 log.info("Discovered: %s at %s:%d", name, addr, info.port)
+                found.set()
 
         def remove_service(self, zc, type_, name):
             pass
@@ -199,20 +878,44 @@ def discover_mcu(timeout_s: float = 5.0) -> tuple[str | None, int | None]:
     zc = Zeroconf()
     try:
         browser = ServiceBrowser(zc, "_mcp._tcp.local.", Listener())
-        deadline = time.monotonic() + timeout_s
-        while time.monotonic() < deadline:
-            if result["host"]:
-                break
-            time.sleep(0.1)
+        found.wait(timeout_s)
     finally:
         zc.close()
 
     if not result["host"]:
         log.warning("mDNS discovery timed out after %.1fs", timeout_s)
+    else:
+        _save_cached_mcu(result["host"], result["port"])
 
     return result["host"], result["port"]
 
 
+# ── Stdin Reader ───────────────────────────────────────────────────────
+
+def read_stdin(inbox: queue.Queue) -> None:
+    """
+    Read JSON-RPC messages from stdin on a background thread.
+
+    Keeps stdin draining while the main thread is blocked on the MCU.
+    Lines are read as raw bytes and forwarded without being decoded,
+    parsed or stripped — the trailing newline is just JSON whitespace to
+    the MCU, which validates the message. Puts each line on the queue,
+    followed by None once stdin is closed.
+    """
+    put = inbox.put
+    try:
+        for line in sys.stdin.buffer:
+            # isspace() scans in place, unlike strip() which copies the line
+            if line.isspace():
+                continue
+
+            put(line)
+    except Exception as e:
+        log.error("stdin read failed: %s", e)
+    finally:
+        inbox.put(None)
+
+
 # ── Main ────────────────────────────────────────────────────────────────
 
 def main():
@@ -225,6 +928,9 @@ Environment variables:
   MCPD_MAX_RETRIES  Max retry attempts on failure [default: 3]
   MCPD_RETRY_DELAY  Base retry delay in seconds [default: 1.0]
   MCPD_TIMEOUT      HTTP request timeout in seconds [default: 30]
+  MCPD_MAX_INFLIGHT Max concurrent requests to the MCU [default: 4]
+  MCPD_PROBE_TIMEOUT TCP probe timeout once the MCU is down [default: 0.2]
+  MCPD_MAX_BATCH    Max requests merged into one batch POST [default: 8]
 """,
     )
     parser.add_argument("--host", help="MCU hostname or IP (e.g. my-device.local)")
@@ -252,44 +958,81 @@ Environment variables:
         parser.error("--host is required (or use --discover)")
 
     base_url = f"http://{host}:{args.port}{args.path}"
-    session_id = None
 
     log.info("Bridge started → %s", base_url)
-    log.info("Config: retries=%d, timeout=%ds, log=%s",
-             MAX_RETRIES, REQUEST_TIMEOUT, LOG_LEVEL)
+    log.info("Config: retries=%d, timeout=%ds, inflight=%d, log=%s",
+             MAX_RETRIES, REQUEST_TIMEOUT, MAX_INFLIGHT, LOG_LEVEL)
 
     # Read JSON-RPC messages from stdin, forward to MCU via HTTP POST
+    inbox: queue.Queue = queue.Queue()
+    threading.Thread(target=read_stdin, args=(inbox,),
+                     name="stdin-reader", daemon=True).start()
+    # A broken stdout pipe ends the loop just like EOF on stdin
+    bridge = Bridge(parse_endpoint(base_url),
+                    on_disconnect=lambda: inbox.put(None))
+
+    # Hot loop: bind the per-message calls once
+    get, get_nowait = inbox.get, inbox.get_nowait
+    submit, submit_all = bridge.submit, bridge.submit_all
+    wait_for_slot = bridge.wait_for_slot
+    expects_response = _expects_response
     try:
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
+        eof = False
+        while not eof:
+            line = get()
+            if line is None:
+                break
 
-            try:
-                msg = json.loads(line)
-            except json.JSONDecodeError as e:
-                log.error("Invalid JSON from stdin: %s", e)
+            if _DEBUG:
+                log.debug("→ MCU: %s",
+                          line[:200].decode("utf-8", "replace").rstrip())
+
+            # Notifications (e.g. notifications/cancelled) never wait for a
+            # request slot
+            if not expects_response(line):
+                submit(line)
                 continue
 
-            log.debug("→ MCU: %s", line[:200])
+            # Once a request slot frees up, drain whatever else queued up
+            # meanwhile so a burst can share one batch POST
+            wait_for_slot()
+            pending = [line]
+            while len(pending) < MAX_BATCH:
+                try:
+                    line = get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    eof = True
+                    break
+                if _DEBUG:
+                    log.debug("→ MCU: %s",
+                              line[:200].decode("utf-8", "replace").rstrip())
+                pending.append(line)
 
-            resp_body, session_id = send_with_retry(
-                base_url, line, session_id, msg
-            )
+            if len(pending) == 1:
+                submit(pending[0])
+            else:
+                submit_all(pending)
 
-            if resp_body is not None:
-                sys.stdout.write(resp_body + "\n")
-                sys.stdout.flush()
+        if bridge.disconnected.is_set():
+            log.info("Pipe broken (client disconnected)")
+            bridge.close(wait=False)
+        else:
+            bridge.close()
 
     except KeyboardInterrupt:
         log.info("Interrupted, shutting down")
-    except BrokenPipeError:
-        log.info("Pipe broken (client disconnected)")
+        bridge.close(wait=False)
     except Exception as e:
         log.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
 
     log.info("Bridge exiting")
+    if bridge.disconnected.is_set():
+        # stdout is gone and the stdin reader is still blocked in a read;
+        # a normal interpreter shutdown would trip over both
+        os._exit(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+Tests for the bridge's raw-message helpers: the JSON-RPC classifiers that
+work on undecoded stdin lines, and the batch reply splitter.
+
+Run with: python -m unittest discover -s host
+"""
+
+import unittest
+
+import mcpd_bridge as bridge
+
+
+class SplitBatchTests(unittest.TestCase):
+
+    def test_splits_each_reply_onto_its_own_line(self):
+        body = b'[{"jsonrpc":"2.0","id":1,"result":{}},{"jsonrpc":"2.0","id":2,"result":{}}]'
+        self.assertEqual(bridge._split_batch(body), [
+            b'{"jsonrpc":"2.0","id":1,"result":{}}\n',
+            b'{"jsonrpc":"2.0","id":2,"result":{}}\n',
+        ])
+
+    def test_ignores_delimiters_inside_strings(self):
+        body = (b'[{"id":1,"result":{"text":"a, b] }{ [c"}},'
+                b'{"id":2,"result":{"text":"say \\"x, y]\\" \\\\"}}]')
+        self.assertEqual(bridge._split_batch(body), [
+            b'{"id":1,"result":{"text":"a, b] }{ [c"}}\n',
+            b'{"id":2,"result":{"text":"say \\"x, y]\\" \\\\"}}\n',
+        ])
+
+    def test_strips_whitespace_between_replies(self):
+        body = b'[\n  {"id": 1, "result": {}} ,\r\n\t{"id": 2, "result": {}}\n]\n'
+        self.assertEqual(bridge._split_batch(body), [
+            b'{"id": 1, "result": {}}\n',
+            b'{"id": 2, "result": {}}\n',
+        ])
+
+    def test_keeps_nested_arrays_and_ids_inside_a_reply(self):
+        body = (b'[{"id":1,"result":{"content":[{"id":7},[1,2]]}},'
+                b'{"id":2,"error":{"code":-32601,"message":"x"}}]')
+        self.assertEqual(bridge._split_batch(body), [
+            b'{"id":1,"result":{"content":[{"id":7},[1,2]]}}\n',
+            b'{"id":2,"error":{"code":-32601,"message":"x"}}\n',
+        ])
+
+    def test_passes_bytes_through_unchanged(self):
+        body = '[{"id":1,"result":{"text":"Grüße ✓"}}]'.encode()
+        self.assertEqual(bridge._split_batch(body),
+                         ['{"id":1,"result":{"text":"Grüße ✓"}}\n'.encode()])
+
+    def test_empty_batch(self):
+        self.assertEqual(bridge._split_batch(b"[]"), [])
+
+    def test_splits_batch_events_in_a_stream(self):
+        stream = iter([b'{"method":"notifications/progress"}\n',
+                       b'[{"id":1,"result":{}},{"id":2,"result":{}}]\n'])
+        self.assertEqual(list(bridge._split_batch_events(stream)), [
+            b'{"method":"notifications/progress"}\n',
+            b'{"id":1,"result":{}}\n',
+            b'{"id":2,"result":{}}\n',
+        ])
+
+
+class ClassifierTests(unittest.TestCase):
+
+    def test_request_expects_response(self):
+        self.assertTrue(bridge._expects_response(
+            b'{"jsonrpc":"2.0","id" : 1,"method":"tools/list"}'))
+
+    def test_notification_expects_no_response(self):
+        self.assertFalse(bridge._expects_response(
+            b'{"jsonrpc":"2.0","method":"notifications/initialized"}'))
+
+    def test_nested_id_errs_towards_expecting_a_response(self):
+        self.assertTrue(bridge._expects_response(
+            b'{"jsonrpc":"2.0","method":"notifications/progress","params":{"id":3}}'))
+
+    def test_client_batch_with_a_request_expects_response(self):
+        self.assertTrue(bridge._expects_response(
+            b'[{"jsonrpc":"2.0","method":"a"},{"jsonrpc":"2.0","id":1,"method":"b"}]'))
+
+    def test_request_is_batchable(self):
+        self.assertTrue(bridge._is_batchable(
+            b'{"jsonrpc":"2.0","id":1,"method":"tools/call","params":{"name":"x"}}'))
+
+    def test_notification_with_nested_id_is_not_batchable(self):
+        self.assertFalse(bridge._is_batchable(
+            b'{"jsonrpc":"2.0","method":"notifications/progress","params":{"id":3}}'))
+
+    def test_initialize_is_not_batchable(self):
+        self.assertFalse(bridge._is_batchable(
+            b'{"jsonrpc":"2.0","id":0,"method":"initialize","params":{}}'))
+
+    def test_client_batch_is_not_batchable(self):
+        self.assertFalse(bridge._is_batchable(
+            b'[{"jsonrpc":"2.0","id":1,"method":"a"}]'))
+        self.assertFalse(bridge._is_batchable(
+            b'  [{"jsonrpc":"2.0","id":1,"method":"a"}]'))
+
+    def test_reply_to_server_request_is_not_batchable(self):
+        self.assertFalse(bridge._is_batchable(
+            b'{"jsonrpc":"2.0","id":5,"result":{}}'))
+
+    def test_null_id_is_not_batchable(self):
+        self.assertFalse(bridge._is_batchable(
+            b'{"jsonrpc":"2.0","id":null,"method":"ping"}'))
+
+    def test_malformed_message_is_not_batchable(self):
+        self.assertFalse(bridge._is_batchable(b'{"id":1,"method":"ping"'))
+
+
+if __name__ == "__main__":
+    unittest.main()